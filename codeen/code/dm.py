@@ -1,8 +1,12 @@
 import os
+import importlib.util
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urlparse, urljoin
 
+# Use the faster lxml parser when it is installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
 # Function to determine the base folder (Kemono or Coomer)
 def determine_base_folder(url):
     parsed_url = urlparse(url)
@@ -44,7 +48,7 @@ def correct_link(link):
 # Function to extract article content and create text files
 def extract_content(link, base_folder, author_folder):
     response = requests.get(link)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.text, HTML_PARSER, parse_only=SoupStrainer('article'))
     articles = soup.find_all("article", class_="dm-card")
 
     dm_folder = os.path.join(base_folder, author_folder, "DMs")
@@ -71,7 +75,7 @@ response = requests.get(link)
 html_content = response.text
 
 # Parse the HTML using BeautifulSoup
-soup = BeautifulSoup(html_content, "html.parser")
+soup = BeautifulSoup(html_content, HTML_PARSER)
 
 # Determine the base folder (Kemono or Coomer)
 base_folder = determine_base_folder(link)
@@ -80,67 +80,73 @@ def baixar_conteudo(url):
     # Function to save post information in a text file
     def salvar_info_post(soup, folder):
         info_file_path = os.path.join(folder, "info.txt")
+        parts = []
+        # Title
+        title_tag = soup.find("h1", class_="post__title")
+        if title_tag:
+            title = " ".join([span.text for span in title_tag.find_all("span")])
+            parts.append(f"Title: {title}\n\n")
+
+        # Publication date
+        published_tag = soup.find("div", class_="post__published")
+        if published_tag:
+            published_date = published_tag.text.strip().split(": ")[1]
+            parts.append(f"Publication date: {published_date}\n\n")
+
+        # Import date
+        imported_tag = soup.find("div", class_="post__added")
+        if imported_tag and ": " in imported_tag.text:
+            imported_date = imported_tag.text.strip().split(": ")[1]
+            parts.append(f"Import date: {imported_date}\n\n")
+
+        # Post content
+        content_section = soup.find("div", class_="post__content")
+        if content_section:
+            content = content_section.get_text(strip=True)
+            parts.append(f"Content:\n{content}\n\n")
+
+        # Tags
+        tags_section = soup.find("section", id="post-tags")
+        if tags_section:
+            tags = [a.text for a in tags_section.find_all("a")]
+            parts.append(f"Tags: {', '.join(tags)}\n\n")
+
+        # Attachments
+        attachment_tags = soup.find_all("a", class_="post__attachment-link")
+        # Map each "browse" link to the attachment it belongs to
+        browse_tags = {
+            id(browse_tag.find_previous("a", class_="post__attachment-link")): browse_tag
+            for browse_tag in soup.find_all("a", href=True, string="browse »")
+        }
+        if attachment_tags:
+            parts.append("Attachments:\n")
+            for attachment_tag in attachment_tags:
+                attachment_url = attachment_tag["href"]
+                attachment_name = attachment_tag.text.strip().split(" ")[-1]
+                parts.append(f"- {attachment_name}: {attachment_url}\n")
+                # Check if there is a "browse" link
+                browse_tag = browse_tags.get(id(attachment_tag))
+                if browse_tag:
+                    browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
+                    parts.append(f"  Attachment content: {browse_url}\n")
+
+        parts.append("\n")  # Adds a line break after attachments
+
+        # Comments
+        if save_comments_txt:
+            comments_section = soup.find("footer", class_="post__footer")
+            if comments_section:
+                comments = comments_section.find_all("article", class_="comment")
+                if comments:
+                    parts.append("Comments:\n")
+                    for comment in comments:
+                        comment_author = comment.find("a", class_="comment__name").text.strip()
+                        comment_text = comment.find("p", class_="comment__message").text.strip()
+                        comment_date = comment.find("time", class_="timestamp")["datetime"]
+                        parts.append(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
+
         with open(info_file_path, "w", encoding="utf-8") as f:
-            # Title
-            title_tag = soup.find("h1", class_="post__title")
-            if title_tag:
-                title = " ".join([span.text for span in title_tag.find_all("span")])
-                f.write(f"Title: {title}\n\n")
-
-            # Publication date
-            published_tag = soup.find("div", class_="post__published")
-            if published_tag:
-                published_date = published_tag.text.strip().split(": ")[1]
-                f.write(f"Publication date: {published_date}\n\n")
-
-            # Import date
-            imported_tag = soup.find("div", class_="post__added")
-            if imported_tag and ": " in imported_tag.text:
-                imported_date = imported_tag.text.strip().split(": ")[1]
-                f.write(f"Import date: {imported_date}\n\n")
-
-            # Post content
-            content_section = soup.find("div", class_="post__content")
-            if content_section:
-                content = content_section.get_text(strip=True)
-                f.write(f"Content:\n{content}\n\n")
-
-            # Tags
-            tags_section = soup.find("section", id="post-tags")
-            if tags_section:
-                tags = [a.text for a in tags_section.find_all("a")]
-                f.write(f"Tags: {', '.join(tags)}\n\n")
-
-            # Attachments
-            attachment_tags = soup.find_all("a", class_="post__attachment-link")
-            if attachment_tags:
-                f.write("Attachments:\n")
-                for attachment_tag in attachment_tags:
-                    attachment_url = attachment_tag["href"]
-                    attachment_name = attachment_tag.text.strip().split(" ")[-1]
-                    f.write(f"- {attachment_name}: {attachment_url}\n")
-                    # Check if there is a "browse" link
-                    browse_tag = attachment_tag.find_next("a", href=True, string="browse »")
-                    if browse_tag:
-                        browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
-                        f.write(f"  Attachment content: {browse_url}\n")
-                        browse_response = requests.get(browse_url)
-                        browse_soup = BeautifulSoup(browse_response.text, "html.parser")
-
-            f.write("\n")  # Adds a line break after attachments
-
-            # Comments
-            if save_comments_txt:
-                comments_section = soup.find("footer", class_="post__footer")
-                if comments_section:
-                    comments = comments_section.find_all("article", class_="comment")
-                    if comments:
-                        f.write("Comments:\n")
-                        for comment in comments:
-                            comment_author = comment.find("a", class_="comment__name").text.strip()
-                            comment_text = comment.find("p", class_="comment__message").text.strip()
-                            comment_date = comment.find("time", class_="timestamp")["datetime"]
-                            f.write(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
+            f.write("".join(parts))
 
     # Save post information if the user wants to
     if save_info_txt:
@@ -1,12 +1,44 @@
 import os
+import importlib.util
 import re
+import shutil
 import requests
+import urllib3
 from requests.adapters import HTTPAdapter, Retry
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse, unquote, parse_qs
 import json
-import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+
+# Use the faster lxml parser when it is installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Number of posts listed by each profile page and each API call
+POSTS_PER_PAGE = 50
+# Number of posts downloaded at the same time while the profile pages are crawled
+MAX_POST_WORKERS = 4
+# Number of profile or API pages fetched at the same time
+MAX_PAGE_WORKERS = 8
+# Number of files downloaded at the same time for each post
+MAX_DOWNLOAD_WORKERS = 8
+# Size of the chunks written to disk while a file is streamed
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+# Buffer used to copy post files (videos, archives) from the socket to disk
+FILE_BUFFER_SIZE = 1 << 20
+# File kept in each posts folder with the ids of the completely downloaded posts
+DOWNLOADED_POSTS_FILE = ".downloaded_posts"
+# Options that change which files of a post are saved, recorded with each downloaded post
+DOWNLOAD_OPTIONS = ("download_attachments", "save_info_txt", "no_folders")
+
+INVALID_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+NON_DIGITS = re.compile(r'\D')
+TOTAL_POSTS = re.compile(r'of\s+(\d[\d,]*)')
+ATTACHMENTS_COUNT = re.compile(r'\d+\s+attachments?', re.IGNORECASE)
+
 # import logging
 
 # Configure logging
@@ -21,6 +53,15 @@ import random
 #         logger.debug(f"Retrying: {reason}")
 #         return super().increment(*args, **kwargs)
 
+user_agent = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/89.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+]
+
+user_agents = random.choice(user_agent)
+
 def create_session():
     session = requests.Session()
     retry_strategy = Retry(
@@ -29,45 +70,64 @@ def create_session():
         status_forcelist=[500, 502, 503, 504],
         allowed_methods=["GET"]
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_POST_WORKERS * MAX_DOWNLOAD_WORKERS + MAX_PAGE_WORKERS, max_retries=retry_strategy)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
+    session.headers.update({
+        'User-Agent': user_agents,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5'
+    })
     return session
 
-def extract_post_info(post_card, base_url):
+def absolute_url(site_root, href):
+    # Cards link with root-relative paths, which only need the site root in front
+    if href and href.startswith('/') and not href.startswith('//'):
+        return site_root + href
+    return urljoin(site_root, href)
+
+def extract_post_info(post_card, site_root):
     post_info = {}
-    post_info['link'] = urljoin(base_url, post_card.find('a')['href'])
-    post_info['title'] = post_card.find('header', class_='post-card__header').text.strip()
-    attachments_div = post_card.find('div', string=lambda x: x and 'attachments' in x.lower())
-    post_info['attachments'] = attachments_div.text.strip() if attachments_div else "No attachments"
-    time_tag = post_card.find('time')
-    post_info['date'] = time_tag['datetime'] if time_tag else "No date available"
-    image_tag = post_card.find('img', class_='post-card__image')
-    post_info['image'] = urljoin(base_url, image_tag['src']) if image_tag else "No image available"
+    post_info['link'] = absolute_url(site_root, post_card.css_first('a').attributes['href'])
+    post_info['title'] = post_card.css_first('header.post-card__header').text().strip()
+    footer = post_card.css_first('footer.post-card__footer')
+    if footer:
+        attachments_match = ATTACHMENTS_COUNT.search(footer.text())
+        post_info['attachments'] = attachments_match.group(0) if attachments_match else "No attachments"
+    else:
+        attachments_div = next((div for div in post_card.css('div') if 'attachments' in div.text(deep=False).lower()), None)
+        post_info['attachments'] = attachments_div.text().strip() if attachments_div else "No attachments"
+    time_tag = post_card.css_first('time')
+    post_info['date'] = time_tag.attributes.get('datetime') if time_tag else "No date available"
+    image_tag = post_card.css_first('img.post-card__image')
+    post_info['image'] = absolute_url(site_root, image_tag.attributes.get('src')) if image_tag else "No image available"
     return post_info
 
-def get_total_posts(soup):
-    total_posts_text = soup.find('small')
-    if total_posts_text:
-        total_posts = int(total_posts_text.text.strip().split(' of ')[1])
+def get_total_posts(tree):
+    total_posts_text = tree.css_first('div.paginator small')
+    match = TOTAL_POSTS.search(total_posts_text.text()) if total_posts_text else None
+    if match:
+        total_posts = int(NON_DIGITS.sub('', match.group(1)))
     else:
         total_posts = None
     return total_posts
 
+@lru_cache(maxsize=4096)
 def sanitize_filename(filename, max_length=130):
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = INVALID_FILENAME_CHARS.sub('_', filename)
     base, ext = os.path.splitext(filename)
     if len(base) + len(ext) > max_length:
         base = base[:max_length - len(ext)]
     return base + ext
 
-def ensure_unique_filename(directory, filename):
+def ensure_unique_filename(existing, filename):
     base, ext = os.path.splitext(filename)
     counter = 1
     new_filename = filename
-    while os.path.exists(os.path.join(directory, new_filename)):
+    while new_filename in existing:
         new_filename = f"{base}_{counter}{ext}"
         counter += 1
+    existing.add(new_filename)
     return new_filename
 
 def get_filename_from_url(url):
@@ -98,36 +158,51 @@ def truncate_path_if_long(path, max_length=130):
     truncated_path = os.path.join(directory, filename + ext)
     return truncated_path
 
+def format_post(post):
+    return (
+        f"Link: {post['link']}\n"
+        f"Title: {post['title']}\n"
+        f"Number of attachments: {post['attachments']}\n"
+        f"Post date: {post['date']}\n"
+        f"Cover image: {post['image']}\n"
+        "\n" + "-"*40 + "\n\n"
+    )
+
 def save_posts_to_file(posts, filename="posts_info.txt"):
     with open(filename, 'w', encoding='utf-8') as f:
-        for post in posts:
-            f.write(f"Link: {post['link']}\n")
-            f.write(f"Title: {post['title']}\n")
-            f.write(f"Number of attachments: {post['attachments']}\n")
-            f.write(f"Post date: {post['date']}\n")
-            f.write(f"Cover image: {post['image']}\n")
-            f.write("\n" + "-"*40 + "\n\n")
+        f.write(''.join(format_post(post) for post in posts))
+
+def is_post_selected(post, config):
+    has_media = post['image'] != "No image available" or post['attachments'] != "No attachments"
+    if config.get('both'):
+        return True
+    if config.get('files_only') and has_media:
+        return True
+    return bool(config.get('no_files') and not has_media)
+
+# Remove what was written of a file whose download failed midway
+def remove_partial_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 # Helper function to download an image and return the local filename
-def download_image(url, save_dir, post_id, config):
+def download_image(url, save_dir, post_id, config, session):
     img_name = os.path.basename(url)
     if not config.get("no_folders", False):
         img_name = f"{post_id}_{img_name}"
     local_path = os.path.join(save_dir, img_name)
-    session = create_session()
-    headers = {
-        'User-Agent': user_agents,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5'
-    }
     try:
-        response = session.get(url, headers=headers, timeout=60, stream=True)
-        response.raise_for_status()
-        with open(local_path, 'wb') as file:
-            file.write(response.content)
+        with session.get(url, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            with open(local_path, 'wb') as file:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
         return img_name
     except Exception as e:
         print(f"Failed to download {url}: {e}")
+        remove_partial_file(local_path)
         return None
 
 def clean_url(url):
@@ -135,12 +210,15 @@ def clean_url(url):
     return cleaned_url
 
 def update_image_sources(content, image_mapping, base_url):
-    for src, local_filename in image_mapping.items():
-        src_cleaned = clean_url(src)
-        content = content.replace(src_cleaned, local_filename)
-    return content
-
-def save_post_info(soup, post_path, post_id, config, base_url):
+    replacements = {clean_url(src): local_filename for src, local_filename in image_mapping.items() if src}
+    if not replacements:
+        return content
+    # Rewrite every source in one pass over the content, longest sources first
+    # so a URL is never replaced through one of its prefixes
+    pattern = re.compile('|'.join(re.escape(src) for src in sorted(replacements, key=len, reverse=True)))
+    return pattern.sub(lambda match: replacements[match.group(0)], content)
+
+def save_post_info(soup, post_path, post_id, config, base_url, session, attachment_tags):
     title_tag = soup.find("h1", class_="post__title")
     title = title_tag.text.strip() if title_tag else "Untitled Post"
     published_tag = soup.find("div", class_="post__published")
@@ -168,7 +246,7 @@ def save_post_info(soup, post_path, post_id, config, base_url):
                 local_filename = os.path.basename(absolute_url)
                 if not local_filename.startswith(post_id + "_"):
                     local_filename = post_id + "_" + local_filename
-                local_filename = download_image(absolute_url, image_dir, post_id, config)
+                local_filename = download_image(absolute_url, image_dir, post_id, config, session)
                 if local_filename:
                     image_mapping[image_url] = local_filename
                     image_mapping[absolute_url] = local_filename
@@ -177,7 +255,7 @@ def save_post_info(soup, post_path, post_id, config, base_url):
                 local_filename = os.path.basename(image_url)
                 if not local_filename.startswith(post_id + "_"):
                     local_filename = post_id + "_" + local_filename
-                local_filename = download_image(image_url, image_dir, post_id, config)
+                local_filename = download_image(image_url, image_dir, post_id, config, session)
                 if local_filename:
                     image_mapping[image_url] = local_filename
                     image_mapping[urljoin(base_url, image_url)] = local_filename
@@ -186,8 +264,7 @@ def save_post_info(soup, post_path, post_id, config, base_url):
     else:
         content_html = "<p>No content available</p>"
 
-    attachments = soup.find_all("a", class_="post__attachment-link")
-    attachment_links = [attachment["href"] for attachment in attachments] if attachments else []
+    attachment_links = [attachment["href"] for attachment in attachment_tags]
     thumbnail_tags = soup.find_all("div", class_="post__thumbnail")
     
     # Handle thumbnails and their filenames
@@ -231,9 +308,12 @@ def save_post_info(soup, post_path, post_id, config, base_url):
     comments = soup.find_all("article", class_="comment")
     comment_sections = []
     for comment in comments:
-        commenter = comment.find("a", class_="comment__name").text.strip() if comment.find("a", class_="comment__name") else "Anonymous"
-        message = comment.find("p", class_="comment__message").text.strip() if comment.find("p", class_="comment__message") else "No message"
-        timestamp = comment.find("time", class_="timestamp").text.strip() if comment.find("time", class_="timestamp") else "Unknown Date"
+        commenter_tag = comment.find("a", class_="comment__name")
+        commenter = commenter_tag.text.strip() if commenter_tag else "Anonymous"
+        message_tag = comment.find("p", class_="comment__message")
+        message = message_tag.text.strip() if message_tag else "No message"
+        timestamp_tag = comment.find("time", class_="timestamp")
+        timestamp = timestamp_tag.text.strip() if timestamp_tag else "Unknown Date"
         comment_sections.append(
             '<article class="comment">\n'
             '    <header class="comment__header">\n'
@@ -251,7 +331,7 @@ def save_post_info(soup, post_path, post_id, config, base_url):
     # List all HTML files in the current directory
     all_html_files = sorted(
         [f for f in os.listdir(post_path) if f.endswith('.html')],
-        key=lambda x: re.sub(r'\D', '', x)
+        key=lambda x: NON_DIGITS.sub('', x)
     )
 
     # Determine the current file's position in the list
@@ -352,90 +432,138 @@ def save_post_info(soup, post_path, post_id, config, base_url):
     with open(info_file_path, "w", encoding="utf-8") as file:
         file.write(html_content)
 
-user_agent = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Firefox/89.0',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-]
-
-user_agents = random.choice(user_agent)
-
-def download_content(url, config):
-    session = create_session()
-
-    headers = {
-        'User-Agent': user_agents,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5'
-    }
+# Helper function to download one image or attachment of a post, called from the download threads
+def download_file(session, file_url, filename, post_path, files_on_disk, claimed_files, lock):
+    with lock:
+        unique_filename = ensure_unique_filename(claimed_files, filename)
+    file_path = os.path.join(post_path, unique_filename)
+    # Failed downloads are removed, so a file already on disk is complete
+    if unique_filename in files_on_disk:
+        return True
     try:
-        response = session.get(url, headers=headers, timeout=60, stream=True)
+        with session.get(file_url, timeout=60, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(file_path, "wb", buffering=FILE_BUFFER_SIZE) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                shutil.copyfileobj(response.raw, f, FILE_BUFFER_SIZE)
+        return True
+    # Reading response.raw raises urllib3 errors directly, requests doesn't wrap them
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+        print(f"Failed to download {file_url}: {e}")
+        remove_partial_file(file_path)
+    except OSError as e:
+        print(f"OSError: {e} - File path: {file_path}")
+        remove_partial_file(file_path)
+    except BaseException:
+        remove_partial_file(file_path)
+        raise
+    return False
+
+# Files of each post folder, listed once and shared by all the posts saved in it,
+# and the names given to the files of this run so that they don't overwrite each other
+folder_files = {}
+claimed_files = {}
+folder_files_lock = threading.Lock()
+
+def get_folder_files(post_path):
+    with folder_files_lock:
+        if post_path not in folder_files:
+            folder_files[post_path] = set(os.listdir(post_path))
+            claimed_files[post_path] = set()
+        return folder_files[post_path], claimed_files[post_path]
+
+# Posts folder of each creator, remembered from their first fetched post so that
+# the following posts can be skipped before any request when already downloaded
+posts_folders = {}
+# Ids of the completely downloaded posts of each posts folder, with the options they
+# were downloaded with, read once per folder
+downloaded_posts = {}
+downloaded_posts_lock = threading.Lock()
+
+def get_downloaded_posts(posts_folder):
+    with downloaded_posts_lock:
+        if posts_folder not in downloaded_posts:
+            try:
+                with open(os.path.join(posts_folder, DOWNLOADED_POSTS_FILE), "r", encoding="utf-8") as f:
+                    downloaded_posts[posts_folder] = set(f.read().split())
+            except FileNotFoundError:
+                downloaded_posts[posts_folder] = set()
+        return downloaded_posts[posts_folder]
+
+# Key of a downloaded post, a post saved with other options is downloaded again
+def get_downloaded_post_key(post_id, config):
+    options = ",".join(f"{option}={int(bool(config.get(option, False)))}" for option in DOWNLOAD_OPTIONS)
+    return f"{post_id}:{options}"
+
+# Record a post once all of its files are on disk, so interrupted posts are retried
+def mark_post_downloaded(posts_folder, post_key):
+    post_keys = get_downloaded_posts(posts_folder)
+    with downloaded_posts_lock:
+        post_keys.add(post_key)
+        with open(os.path.join(posts_folder, DOWNLOADED_POSTS_FILE), "a", encoding="utf-8") as f:
+            f.write(f"{post_key}\n")
+
+def download_content(url, config, session):
+    creator_url, _, post_id = urlparse(url).path.rstrip("/").rpartition("/post/")
+    posts_folder = posts_folders.get(creator_url)
+    if posts_folder and get_downloaded_post_key(post_id, config) in get_downloaded_posts(posts_folder):
+        print(f"Post content from {url} already downloaded, skipping.")
+        return True
+    try:
+        response = session.get(url, timeout=60, stream=True)
         response.raise_for_status()
         html_content = response.text
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         parsed_url = urlparse(url)
         base_folder = "Kemono" if "kemono.su" in parsed_url.netloc or "kemono.party" in parsed_url.netloc else "Coomer"
+        og_image = soup.find("meta", property="og:image")
+        og_content = og_image["content"] if og_image else None
         author_tag = soup.find("a", class_="post__user-name")
         if author_tag:
             author_name = author_tag.text.strip()
+        elif og_content:
+            author_name = og_content.split("/")[-1].split("-")[0]
         else:
-            meta_tag = soup.find("meta", property="og:image")
-            if meta_tag:
-                author_name = meta_tag["content"].split("/")[-1].split("-")[0]
-            else:
-                author_name = "UnknownAuthor"
-        platform_name = urlparse(soup.find("meta", property="og:image")["content"]).path.split("/")[2] if soup.find("meta", property="og:image") else "UnknownPlatform"
+            author_name = "UnknownAuthor"
+        platform_name = urlparse(og_content).path.split("/")[2] if og_content else "UnknownPlatform"
         post_id = soup.find("meta", attrs={"name": "id"})["content"]
+        posts_folder = os.path.abspath(os.path.join(base_folder, f"{author_name}-{platform_name}", "posts"))
+        posts_folders[creator_url] = posts_folder
+        post_key = get_downloaded_post_key(post_id, config)
+        if post_key in get_downloaded_posts(posts_folder):
+            print(f"Post content from {url} already downloaded, skipping.")
+            return True
         if config.get("no_folders", False):
-            post_path = os.path.abspath(os.path.join(base_folder, f"{author_name}-{platform_name}", "posts", post_id))
+            post_path = os.path.join(posts_folder, post_id)
         else:
-            post_path = os.path.abspath(os.path.join(base_folder, f"{author_name}-{platform_name}", "posts"))
-        if not os.path.exists(post_path):
-            os.makedirs(post_path)
+            post_path = posts_folder
+        os.makedirs(post_path, exist_ok=True)
+        attachment_tags = soup.find_all("a", class_="post__attachment-link")
         if config.get("save_info_txt", False):
-            save_post_info(soup, post_path, post_id, config, base_url)
-        downloaded_links = set()
-        image_tags = soup.find_all("a", class_="fileThumb")
-        for img_tag in image_tags:
-            image_url = img_tag["href"]
-            filename = sanitize_filename(get_filename_from_url(image_url))
-            filename_with_id = f"{post_id}_{filename}" if not config.get("no_folders", False) else filename
-            file_path = os.path.join(post_path, filename_with_id)
-            file_path = truncate_path_if_long(file_path)
-            unique_filename = ensure_unique_filename(post_path, filename_with_id)
-            file_path = os.path.join(post_path, unique_filename)
-            if not os.path.exists(file_path):
-                try:
-                    image_response = session.get(image_url, timeout=60)
-                    image_response.raise_for_status()
-                    with open(file_path, "wb") as f:
-                        f.write(image_response.content)
-                    downloaded_links.add(image_url)
-                except requests.exceptions.RequestException as e:
-                    print(f"Failed to download image {image_url}: {e}")
-                except OSError as e:
-                    print(f"OSError: {e} - File path: {file_path}")
+            save_post_info(soup, post_path, post_id, config, base_url, session, attachment_tags)
+        # Files shown in several sections of the post are only fetched once
+        file_tags = soup.find_all("a", class_="fileThumb")
         if config.get("download_attachments", False):
-            attachment_tags = soup.find_all("a", class_="post__attachment-link")
-            for attachment_tag in attachment_tags:
-                attachment_url = attachment_tag["href"]
-                filename = sanitize_filename(get_filename_from_url(attachment_url))
-                filename_with_id = f"{post_id}_{filename}" if not config.get("no_folders", False) else filename
-                file_path = os.path.join(post_path, filename_with_id)
-                file_path = truncate_path_if_long(file_path)
-                unique_filename = ensure_unique_filename(post_path, filename_with_id)
-                file_path = os.path.join(post_path, unique_filename)
-                if not os.path.exists(file_path):
-                    try:
-                        attachment_response = session.get(attachment_url, timeout=60)
-                        attachment_response.raise_for_status()
-                        with open(file_path, "wb") as f:
-                            f.write(attachment_response.content)
-                        downloaded_links.add(attachment_url)
-                    except requests.exceptions.RequestException as e:
-                        print(f"Failed to download attachment {attachment_url}: {e}")
+            file_tags += attachment_tags
+        urls_to_fetch = {}
+        for file_tag in file_tags:
+            file_url = file_tag["href"]
+            if file_url in urls_to_fetch:
+                continue
+            filename = sanitize_filename(get_filename_from_url(file_url))
+            urls_to_fetch[file_url] = f"{post_id}_{filename}" if not config.get("no_folders", False) else filename
+        files_on_disk, claimed = get_folder_files(post_path)
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as download_executor:
+            futures = [download_executor.submit(download_file, session, file_url, filename, post_path, files_on_disk, claimed, folder_files_lock) for file_url, filename in urls_to_fetch.items()]
+        failed_files = sum(1 for future in futures if not future.result())
+        if failed_files:
+            print(f"Post content from {url} downloaded with {failed_files} failed file(s).")
+            return False
+        mark_post_downloaded(posts_folder, post_key)
         print(f"Post content from {url} successfully downloaded!")
+        return True
     except requests.exceptions.ChunkedEncodingError as e:
         print(f"ChunkedEncodingError occurred: {e}")
     except requests.exceptions.RequestException as e:
@@ -448,67 +576,176 @@ def download_content(url, config):
         print(f"Timeout error occurred: {timeout_err}")
     except requests.exceptions.RequestException as req_err:
         print(f"General error occurred: {req_err}")
+    return False
 
-def process_page(url, session, config):
-    headers = {
-        'User-Agent': user_agents,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5'
-    }
+def fetch_page(session, url):
     try:
-        response = session.get(url, headers=headers, timeout=20)
+        response = session.get(url, timeout=20)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        post_cards = soup.find_all('article', class_='post-card post-card--preview')
-        if not post_cards:
-            return [], False
-        posts = []
-        for post_card in post_cards:
-            post_info = extract_post_info(post_card, url)
-            posts.append(post_info)
-            download_content(post_info['link'], config)
-        paginator = soup.find('div', class_='paginator')
-        if paginator:
-            next_page_link = paginator.find('a', class_='next')
-            has_next_page = next_page_link is not None
-        else:
-            has_next_page = False
-        return posts, has_next_page
+        return response.text
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to retrieve page: {e}")
-        return [], False
+        print(f"Failed to retrieve page {url}: {e}")
+        return None
+
+def fetch_api_page(session, url):
+    try:
+        response = session.get(url, timeout=20)
+        response.raise_for_status()
+        return response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Failed to retrieve API page {url}: {e}")
+        return None
+
+def get_api_url(parsed_url):
+    path_parts = parsed_url.path.strip('/').split('/')
+    if len(path_parts) < 3 or path_parts[1] != 'user':
+        return None
+    service, _, user_id = path_parts[:3]
+    return f"{parsed_url.scheme}://{parsed_url.netloc}/api/v1/{service}/user/{user_id}"
+
+def extract_api_post_info(post, site_root):
+    post_info = {}
+    post_info['link'] = f"{site_root}/{post['service']}/user/{post['user']}/post/{post['id']}"
+    post_info['title'] = (post.get('title') or "").strip()
+    file_path = (post.get('file') or {}).get('path')
+    attachments = len(post.get('attachments') or []) + (1 if file_path else 0)
+    post_info['attachments'] = f"{attachments} attachment{'s' if attachments > 1 else ''}" if attachments else "No attachments"
+    post_info['date'] = post.get('published') or "No date available"
+    post_info['image'] = f"{site_root}/data{file_path}" if file_path else "No image available"
+    return post_info
+
+# Download of every queued post, checked once the crawl is over
+post_futures = []
+
+def report_post_error(url, future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Error downloading post content from {url}: {future.exception()!r}")
+
+def queue_post(post_info, session, config, executor, posts_file):
+    if not is_post_selected(post_info, config):
+        return False
+    posts_file.write(format_post(post_info))
+    future = executor.submit(download_content, post_info['link'], config, session)
+    future.add_done_callback(partial(report_post_error, post_info['link']))
+    post_futures.append(future)
+    return True
+
+def process_page(tree, site_root, session, config, executor, posts_file):
+    saved_posts = 0
+    for post_card in tree.css('article.post-card--preview'):
+        saved_posts += queue_post(extract_post_info(post_card, site_root), session, config, executor, posts_file)
+    # Write the buffered posts of this page so an interrupted run keeps them
+    posts_file.flush()
+    return saved_posts
+
+def process_api_page(posts, site_root, session, config, executor, posts_file):
+    saved_posts = 0
+    for post in posts:
+        saved_posts += queue_post(extract_api_post_info(post, site_root), session, config, executor, posts_file)
+    posts_file.flush()
+    return saved_posts
+
+# Crawl the profile through the JSON API, returns None when the API can't be used
+def crawl_api(api_url, site_root, session, config, executor, posts_file):
+    first_page = fetch_api_page(session, api_url)
+    if not isinstance(first_page, list):
+        return None
+    saved_posts = process_api_page(first_page, site_root, session, config, executor, posts_file)
+    failed_page_urls = []
+    has_more_pages = len(first_page) >= POSTS_PER_PAGE
+    offset = POSTS_PER_PAGE
+    fetch = lambda page_url: fetch_api_page(session, page_url)
+    # The API doesn't give the post count, so the offsets are fetched in batches until a page comes back short
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as page_executor:
+        while has_more_pages:
+            page_urls = [f"{api_url}?o={offset + index * POSTS_PER_PAGE}" for index in range(MAX_PAGE_WORKERS)]
+            offset += MAX_PAGE_WORKERS * POSTS_PER_PAGE
+            batch_failed_urls = []
+            for page_url, page in zip(page_urls, page_executor.map(fetch, page_urls)):
+                # A failed page doesn't end the listing, only a short page does
+                if not isinstance(page, list):
+                    batch_failed_urls.append(page_url)
+                    continue
+                saved_posts += process_api_page(page, site_root, session, config, executor, posts_file)
+                if len(page) < POSTS_PER_PAGE:
+                    has_more_pages = False
+                    break
+            failed_page_urls += batch_failed_urls
+            # Stop when a whole batch fails, the API is no longer answering
+            if len(batch_failed_urls) == len(page_urls):
+                has_more_pages = False
+        # Give the failed pages a second try once the rest of the listing is done
+        failed_pages = 0
+        for page in page_executor.map(fetch, failed_page_urls):
+            if not isinstance(page, list):
+                failed_pages += 1
+                continue
+            saved_posts += process_api_page(page, site_root, session, config, executor, posts_file)
+    return saved_posts, failed_pages
+
+# Crawl the profile through its HTML pages, returns the saved posts and the pages that couldn't be retrieved
+def crawl_pages(base_url, site_root, session, config, executor, posts_file):
+    first_page = fetch_page(session, base_url)
+    if first_page is None:
+        return 0, 1
+    tree = LexborHTMLParser(first_page)
+    saved_posts = process_page(tree, site_root, session, config, executor, posts_file)
+    failed_pages = 0
+    total_posts = get_total_posts(tree)
+    if total_posts is None:
+        # Without the post count, follow the next page links one page at a time
+        page_number = 1
+        while tree.css_first('div.paginator a.next'):
+            page = fetch_page(session, f"{base_url}?o={page_number * POSTS_PER_PAGE}")
+            if page is None:
+                failed_pages += 1
+                break
+            tree = LexborHTMLParser(page)
+            saved_posts += process_page(tree, site_root, session, config, executor, posts_file)
+            page_number += 1
+        return saved_posts, failed_pages
+    total_pages = (total_posts + POSTS_PER_PAGE - 1) // POSTS_PER_PAGE
+    # The remaining pages are independent, fetch them together and parse them in order
+    page_urls = [f"{base_url}?o={page_number * POSTS_PER_PAGE}" for page_number in range(1, total_pages)]
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as page_executor:
+        for page in page_executor.map(lambda page_url: fetch_page(session, page_url), page_urls):
+            if page is None:
+                failed_pages += 1
+                continue
+            saved_posts += process_page(LexborHTMLParser(page), site_root, session, config, executor, posts_file)
+    return saved_posts, failed_pages
 
 with open("code/profileconfig.json", "r") as f:
     config = json.load(f)
 
 base_url = input("Please enter the Profile URL: ")
-all_posts = []
+parsed_base_url = urlparse(base_url)
+site_root = f"{parsed_base_url.scheme}://{parsed_base_url.netloc}"
+api_url = get_api_url(parsed_base_url)
 
 session = create_session()
-page_number = 0
-has_more_pages = True
-
-while has_more_pages:
-    url = f"{base_url}?o={page_number * 50}" if page_number > 0 else base_url
-    posts, has_more_pages = process_page(url, session, config)
-    if not posts:
-        print(f"No more post cards found on page {page_number}. Ending pagination.")
-        has_more_pages = False
-    else:
-        all_posts.extend(posts)
-        page_number += 1
-        time.sleep(random.uniform(2, 5))
-
-filtered_posts = []
-for post in all_posts:
-    has_media = post['image'] != "No image available" or post['attachments'] != "No attachments"
-    if config.get('both'):
-        filtered_posts.append(post)
-    elif config.get('files_only') and has_media:
-        filtered_posts.append(post)
-    elif config.get('no_files') and not has_media:
-        filtered_posts.append(post)
 
-save_posts_to_file(filtered_posts)
-
-print(f"Information from {len(filtered_posts)} posts saved and content downloaded successfully!")
\ No newline at end of file
+# Posts are downloaded in the background while the next pages are crawled
+saved_posts, failed_pages = 0, 0
+with open("posts_info.txt", "w", encoding="utf-8", buffering=FILE_BUFFER_SIZE) as posts_file, \
+        ThreadPoolExecutor(max_workers=MAX_POST_WORKERS) as executor:
+    try:
+        crawl_result = crawl_api(api_url, site_root, session, config, executor, posts_file) if api_url else None
+        if crawl_result is None:
+            print("Profile API unavailable, reading the profile pages instead.")
+            crawl_result = crawl_pages(base_url, site_root, session, config, executor, posts_file)
+        saved_posts, failed_pages = crawl_result
+        wait(post_futures)
+    except KeyboardInterrupt:
+        # Drop the queued posts instead of waiting for all of them to download
+        print("Interrupted, waiting for the posts already being downloaded...")
+        executor.shutdown(wait=False, cancel_futures=True)
+        saved_posts = len(post_futures)
+
+failed_posts = sum(1 for future in post_futures
+                   if future.cancelled() or future.exception() is not None or not future.result())
+if failed_pages or failed_posts:
+    print(f"Information from {saved_posts} posts saved, {failed_pages} profile page(s) not retrieved, "
+          f"content of {failed_posts} post(s) not downloaded.")
+else:
+    print(f"Information from {saved_posts} posts saved and content downloaded successfully!")
@@ -1,15 +1,21 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import re
 from urllib.parse import urlparse
 import argparse
 import os
+import importlib.util
+
+# Use the faster lxml parser when it is installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
 
 # Function to get the total number of posts
 def get_total_posts(profile_url):
     response = requests.get(profile_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Only the paginator and the post cards are needed; the strainer matches the raw class attribute
+    soup = BeautifulSoup(response.text, HTML_PARSER,
+                         parse_only=SoupStrainer(['div', 'article'], class_=re.compile(r'\b(paginator|post-card)\b')))
 
     paginator_info = soup.find('div', {'class': 'paginator'})
     if paginator_info and paginator_info.find('small'):
@@ -26,7 +32,7 @@ def get_posts_links(profile_url, page_number):
     offset = page_number * 50
     page_url = f"{profile_url}?o={offset}"
     response = requests.get(page_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.text, HTML_PARSER, parse_only=SoupStrainer('article'))
     domain = re.search(r'https?://[^/]+', profile_url).group(0)
 
     posts = []
@@ -39,7 +45,7 @@ def get_posts_links(profile_url, page_number):
 # Function to get author name, site domain, and platform
 def get_author_platform_info(profile_url):
     response = requests.get(profile_url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.text, HTML_PARSER)
 
     # Get author name
     author_tag = soup.find("a", class_="post__user-name")
@@ -37,6 +37,7 @@ def check_install_dependencies():
     try:
         import requests
         from bs4 import BeautifulSoup
+        from selectolax.lexbor import LexborHTMLParser
     except ImportError:
         print("Necessary libraries not found.")
         choice = input("Do you want to install the necessary libraries? (y/n): ").strip().lower()
@@ -4,6 +4,11 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import json
 
+# Extensões de arquivo tratadas como vídeo pela opção de baixar vídeos
+VIDEO_EXTS = {".mp4", ".m4v", ".mov", ".webm", ".mkv", ".avi", ".wmv", ".flv"}
+# Tamanho dos blocos gravados no disco durante o download de um arquivo
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
 # Carregar configurações do arquivo JSON
 with open("code/config.json", "r") as f:
     config = json.load(f)
@@ -30,6 +35,32 @@ else:
     print("Escolha inválida. Saindo.")
     exit()
 
+# Função para remover um arquivo que não foi baixado por completo
+def remover_arquivo_parcial(file_path):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+# Função para baixar um arquivo em blocos, sem manter o conteúdo inteiro na memória
+def baixar_arquivo(file_url, file_path):
+    try:
+        with requests.get(file_url, stream=True) as response:
+            response.raise_for_status()
+            with open(file_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+    # O iter_content converte os erros do urllib3 durante a leitura em exceções do requests
+    except requests.exceptions.RequestException as e:
+        print(f"Falha ao baixar {file_url}: {e}")
+        remover_arquivo_parcial(file_path)
+    except OSError as e:
+        print(f"Erro ao salvar {file_path}: {e}")
+        remover_arquivo_parcial(file_path)
+    except BaseException:
+        remover_arquivo_parcial(file_path)
+        raise
+
 # Função para baixar conteúdo de uma URL
 def baixar_conteudo(url):
     # Fazendo a requisição HTTP e obtendo o conteúdo HTML
@@ -81,67 +112,73 @@ def baixar_conteudo(url):
     # Função para salvar informações do post em um arquivo de texto
     def salvar_info_post(soup, folder):
         info_file_path = os.path.join(folder, "info.txt")
+        parts = []
+        # Título
+        title_tag = soup.find("h1", class_="post__title")
+        if title_tag:
+            title = " ".join([span.text for span in title_tag.find_all("span")])
+            parts.append(f"Título: {title}\n\n")
+
+        # Data de publicação
+        published_tag = soup.find("div", class_="post__published")
+        if published_tag:
+            published_date = published_tag.text.strip().split(": ")[1]
+            parts.append(f"Data de publicação: {published_date}\n\n")
+
+        # Data de importação
+        imported_tag = soup.find("div", class_="post__added")
+        if imported_tag and ": " in imported_tag.text:
+            imported_date = imported_tag.text.strip().split(": ")[1]
+            parts.append(f"Data de importação: {imported_date}\n\n")
+
+        # Conteúdo do post
+        content_section = soup.find("div", class_="post__content")
+        if content_section:
+            content = content_section.get_text(strip=True)
+            parts.append(f"Conteúdo:\n{content}\n\n")
+
+        # Tags
+        tags_section = soup.find("section", id="post-tags")
+        if tags_section:
+            tags = [a.text for a in tags_section.find_all("a")]
+            parts.append(f"Tags: {', '.join(tags)}\n\n")
+
+        # Anexos
+        attachment_tags = soup.find_all("a", class_="post__attachment-link")
+        # Associa cada link "browse" ao anexo ao qual pertence
+        browse_tags = {
+            id(browse_tag.find_previous("a", class_="post__attachment-link")): browse_tag
+            for browse_tag in soup.find_all("a", href=True, string="browse »")
+        }
+        if attachment_tags:
+            parts.append("Anexos:\n")
+            for attachment_tag in attachment_tags:
+                attachment_url = attachment_tag["href"]
+                attachment_name = attachment_tag.text.strip().split(" ")[-1]
+                parts.append(f"- {attachment_name}: {attachment_url}\n")
+                # Verifica se existe um link "browse"
+                browse_tag = browse_tags.get(id(attachment_tag))
+                if browse_tag:
+                    browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
+                    parts.append(f"  Conteúdo do anexo: {browse_url}\n")
+
+        parts.append("\n")  # Adiciona uma quebra de linha após os anexos
+
+        # Comentários
+        if salvar_comentarios_txt:
+            comments_section = soup.find("footer", class_="post__footer")
+            if comments_section:
+                comments = comments_section.find_all("article", class_="comment")
+                if comments:
+                    parts.append("Comentários:\n")
+                    for comment in comments:
+                        comment_author = comment.find("a", class_="comment__name").text.strip()
+                        comment_text = comment.find("p", class_="comment__message").text.strip()
+                        comment_date = comment.find("time", class_="timestamp")["datetime"]
+                        parts.append(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
+
         with open(info_file_path, "w", encoding="utf-8") as f:
-            # Título
-            title_tag = soup.find("h1", class_="post__title")
-            if title_tag:
-                title = " ".join([span.text for span in title_tag.find_all("span")])
-                f.write(f"Título: {title}\n\n")
-
-            # Data de publicação
-            published_tag = soup.find("div", class_="post__published")
-            if published_tag:
-                published_date = published_tag.text.strip().split(": ")[1]
-                f.write(f"Data de publicação: {published_date}\n\n")
-
-            # Data de importação
-            imported_tag = soup.find("div", class_="post__added")
-            if imported_tag and ": " in imported_tag.text:
-                imported_date = imported_tag.text.strip().split(": ")[1]
-                f.write(f"Data de importação: {imported_date}\n\n")
-
-            # Conteúdo do post
-            content_section = soup.find("div", class_="post__content")
-            if content_section:
-                content = content_section.get_text(strip=True)
-                f.write(f"Conteúdo:\n{content}\n\n")
-
-            # Tags
-            tags_section = soup.find("section", id="post-tags")
-            if tags_section:
-                tags = [a.text for a in tags_section.find_all("a")]
-                f.write(f"Tags: {', '.join(tags)}\n\n")
-
-            # Anexos
-            attachment_tags = soup.find_all("a", class_="post__attachment-link")
-            if attachment_tags:
-                f.write("Anexos:\n")
-                for attachment_tag in attachment_tags:
-                    attachment_url = attachment_tag["href"]
-                    attachment_name = attachment_tag.text.strip().split(" ")[-1]
-                    f.write(f"- {attachment_name}: {attachment_url}\n")
-                    # Verifica se existe um link "browse"
-                    browse_tag = attachment_tag.find_next("a", href=True, string="browse »")
-                    if browse_tag:
-                        browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
-                        f.write(f"  Conteúdo do anexo: {browse_url}\n")
-                        browse_response = requests.get(browse_url)
-                        browse_soup = BeautifulSoup(browse_response.text, "html.parser")
-
-            f.write("\n")  # Adiciona uma quebra de linha após os anexos
-
-            # Comentários
-            if salvar_comentarios_txt:
-                comments_section = soup.find("footer", class_="post__footer")
-                if comments_section:
-                    comments = comments_section.find_all("article", class_="comment")
-                    if comments:
-                        f.write("Comentários:\n")
-                        for comment in comments:
-                            comment_author = comment.find("a", class_="comment__name").text.strip()
-                            comment_text = comment.find("p", class_="comment__message").text.strip()
-                            comment_date = comment.find("time", class_="timestamp")["datetime"]
-                            f.write(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
+            f.write("".join(parts))
 
     # Salvar informações do post se o usuário desejar
     if salvar_info_txt:
@@ -159,56 +196,33 @@ def baixar_conteudo(url):
         image_url = img_tag["href"]
         # Verificando se a imagem já foi baixada
         if image_url not in links_baixados:
-            # Fazendo o download da imagem
-            image_response = requests.get(image_url)
             # Obtendo o nome do arquivo
             filename = f"image_{index + 1}.jpg"
-            # Salvando a imagem na pasta do post
-            with open(os.path.join(post_path, filename), "wb") as f:
-                f.write(image_response.content)
+            # Baixando a imagem para a pasta do post
+            baixar_arquivo(image_url, os.path.join(post_path, filename))
             # Adicionando a URL ao conjunto de links baixados
             links_baixados.add(image_url)
 
-    # Verificando se o usuário deseja baixar anexos do post
-    if baixar_anexos:
-        # Encontrando as tags de anexo
+    # Verificando se o usuário deseja baixar anexos ou vídeos do post
+    if baixar_anexos or baixar_videos:
+        # Encontrando as tags de anexo (os vídeos também são anexos)
         attachment_tags = soup.find_all("a", class_="post__attachment-link")
         # Iterando sobre as tags de anexo
         for index, attachment_tag in enumerate(attachment_tags):
-            # Obtendo a URL do anexo
+            # Obtendo a URL e o nome do arquivo
             attachment_url = attachment_tag["href"]
-            # Verificando se o anexo já foi baixado
+            filename = attachment_tag["download"]
+            # Os anexos são baixados com baixar_anexos; os vídeos também com baixar_videos
+            is_video = os.path.splitext(filename)[1].lower() in VIDEO_EXTS
+            if not (baixar_anexos or (is_video and baixar_videos)):
+                continue
+            # Verificando se o arquivo já foi baixado
             if attachment_url not in links_baixados:
-                # Fazendo o download do anexo
-                attachment_response = requests.get(attachment_url)
-                # Obtendo o nome do arquivo
-                filename = attachment_tag["download"]
-                # Salvando o anexo na pasta do post
-                with open(os.path.join(post_path, filename), "wb") as f:
-                    f.write(attachment_response.content)
+                # Baixando o arquivo para a pasta do post
+                baixar_arquivo(attachment_url, os.path.join(post_path, filename))
                 # Adicionando a URL ao conjunto de links baixados
                 links_baixados.add(attachment_url)
 
-    # Verificando se o usuário deseja baixar vídeos
-    if baixar_videos:
-        # Encontrando as tags de vídeo
-        video_tags = soup.find_all("a", class_="post__attachment-link")
-        # Iterando sobre as tags de vídeo
-        for index, video_tag in enumerate(video_tags):
-            # Obtendo a URL do vídeo
-            video_url = video_tag["href"]
-            # Verificando se o vídeo já foi baixado
-            if video_url not in links_baixados:
-                # Fazendo o download do vídeo
-                video_response = requests.get(video_url)
-                # Obtendo o nome do arquivo
-                filename = video_tag["download"]
-                # Salvando o vídeo na pasta do post
-                with open(os.path.join(post_path, filename), "wb") as f:
-                    f.write(video_response.content)
-                # Adicionando a URL ao conjunto de links baixados
-                links_baixados.add(video_url)
-
     print(f"Conteúdo do post {url} baixado com sucesso!")
 
 # Iterar sobre todas as URLs fornecidas e baixar o conteúdo
@@ -4,6 +4,11 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import json
 
+# Extensões de arquivo tratadas como vídeo pela opção de baixar vídeos
+VIDEO_EXTS = {".mp4", ".m4v", ".mov", ".webm", ".mkv", ".avi", ".wmv", ".flv"}
+# Tamanho dos blocos gravados no disco durante o download de um arquivo
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
 # Função para extrair informações de um post
 def extract_post_info(post_card, base_url):
     post_info = {}
@@ -32,69 +37,104 @@ def get_total_posts(soup):
 
 # Função para salvar os posts em um arquivo de texto
 def save_posts_to_file(posts, filename="posts_info.txt"):
+    parts = []
+    for post in posts:
+        parts.append(f"Link: {post['link']}\n")
+        parts.append(f"Título: {post['title']}\n")
+        parts.append(f"Número de arquivos: {post['attachments']}\n")
+        parts.append(f"Data do post: {post['date']}\n")
+        parts.append(f"Capa: {post['image']}\n")
+        parts.append("\n" + "-"*40 + "\n\n")
     with open(filename, 'w', encoding='utf-8') as f:
-        for post in posts:
-            f.write(f"Link: {post['link']}\n")
-            f.write(f"Título: {post['title']}\n")
-            f.write(f"Número de arquivos: {post['attachments']}\n")
-            f.write(f"Data do post: {post['date']}\n")
-            f.write(f"Capa: {post['image']}\n")
-            f.write("\n" + "-"*40 + "\n\n")
+        f.write(''.join(parts))
 
 # Função para salvar informações do post em um arquivo de texto
-def salvar_info_post(soup, folder, salvar_comentarios_txt):
+def salvar_info_post(soup, folder, url, salvar_comentarios_txt):
     info_file_path = os.path.join(folder, "info.txt")
-    with open(info_file_path, "w", encoding="utf-8") as f:
-        title_tag = soup.find("h1", class_="post__title")
-        if title_tag:
-            title = " ".join([span.text for span in title_tag.find_all("span")])
-            f.write(f"Título: {title}\n\n")
-
-        published_tag = soup.find("div", class_="post__published")
-        if published_tag:
-            published_date = published_tag.text.strip().split(": ")[1]
-            f.write(f"Data de publicação: {published_date}\n\n")
-
-        imported_tag = soup.find("div", class_="post__added")
-        if imported_tag and ": " in imported_tag.text:
-            imported_date = imported_tag.text.strip().split(": ")[1]
-            f.write(f"Data de importação: {imported_date}\n\n")
-
-        tags_section = soup.find("section", id="post-tags")
-        if tags_section:
-            tags = [a.text for a in tags_section.find_all("a")]
-            f.write(f"Tags: {', '.join(tags)}\n\n")
+    parts = []
+    title_tag = soup.find("h1", class_="post__title")
+    if title_tag:
+        title = " ".join([span.text for span in title_tag.find_all("span")])
+        parts.append(f"Título: {title}\n\n")
+
+    published_tag = soup.find("div", class_="post__published")
+    if published_tag:
+        published_date = published_tag.text.strip().split(": ")[1]
+        parts.append(f"Data de publicação: {published_date}\n\n")
+
+    imported_tag = soup.find("div", class_="post__added")
+    if imported_tag and ": " in imported_tag.text:
+        imported_date = imported_tag.text.strip().split(": ")[1]
+        parts.append(f"Data de importação: {imported_date}\n\n")
+
+    tags_section = soup.find("section", id="post-tags")
+    if tags_section:
+        tags = [a.text for a in tags_section.find_all("a")]
+        parts.append(f"Tags: {', '.join(tags)}\n\n")
+
+    attachment_tags = soup.find_all("a", class_="post__attachment-link")
+    browse_tags = {
+        id(browse_tag.find_previous("a", class_="post__attachment-link")): browse_tag
+        for browse_tag in soup.find_all("a", href=True, string="browse »")
+    }
+    if attachment_tags:
+        parts.append("Anexos:\n")
+        for attachment_tag in attachment_tags:
+            attachment_url = attachment_tag["href"]
+            attachment_name = attachment_tag.text.strip().split(" ")[-1]
+            parts.append(f"- {attachment_name}: {attachment_url}\n")
+            browse_tag = browse_tags.get(id(attachment_tag))
+            if browse_tag:
+                browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
+                parts.append(f"  Conteúdo do anexo: {browse_url}\n")
+
+    content_div = soup.find("div", class_="post__content")
+    if content_div:
+        content_pre = content_div.find("pre")
+        if content_pre:
+            content_text = content_pre.text.strip()
+            parts.append(f"\nConteúdo do Post:\n{content_text}\n\n")
+
+    if salvar_comentarios_txt:
+        comments_section = soup.find("footer", class_="post__footer")
+        if comments_section:
+            comments = comments_section.find_all("article", class_="comment")
+            if comments:
+                parts.append("Comentários:\n")
+                for comment in comments:
+                    comment_author = comment.find("a", class_="comment__name").text.strip()
+                    comment_text = comment.find("p", class_="comment__message").text.strip()
+                    comment_date = comment.find("time", class_="timestamp")["datetime"]
+                    parts.append(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
 
-        attachment_tags = soup.find_all("a", class_="post__attachment-link")
-        if attachment_tags:
-            f.write("Anexos:\n")
-            for attachment_tag in attachment_tags:
-                attachment_url = attachment_tag["href"]
-                attachment_name = attachment_tag.text.strip().split(" ")[-1]
-                f.write(f"- {attachment_name}: {attachment_url}\n")
-                browse_tag = attachment_tag.find_next("a", href=True, string="browse »")
-                if browse_tag:
-                    browse_url = urlparse(url)._replace(path=browse_tag["href"]).geturl()
-                    f.write(f"  Conteúdo do anexo: {browse_url}\n")
-
-        content_div = soup.find("div", class_="post__content")
-        if content_div:
-            content_pre = content_div.find("pre")
-            if content_pre:
-                content_text = content_pre.text.strip()
-                f.write(f"\nConteúdo do Post:\n{content_text}\n\n")
-
-        if salvar_comentarios_txt:
-            comments_section = soup.find("footer", class_="post__footer")
-            if comments_section:
-                comments = comments_section.find_all("article", class_="comment")
-                if comments:
-                    f.write("Comentários:\n")
-                    for comment in comments:
-                        comment_author = comment.find("a", class_="comment__name").text.strip()
-                        comment_text = comment.find("p", class_="comment__message").text.strip()
-                        comment_date = comment.find("time", class_="timestamp")["datetime"]
-                        f.write(f"- {comment_author} ({comment_date}): {comment_text}\n\n")
+    with open(info_file_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+
+# Função para remover um arquivo que não foi baixado por completo
+def remover_arquivo_parcial(file_path):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+# Função para baixar um arquivo em blocos, sem manter o conteúdo inteiro na memória
+def baixar_arquivo(file_url, file_path):
+    try:
+        with requests.get(file_url, stream=True) as response:
+            response.raise_for_status()
+            with open(file_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+    # O iter_content converte os erros do urllib3 durante a leitura em exceções do requests
+    except requests.exceptions.RequestException as e:
+        print(f"Falha ao baixar {file_url}: {e}")
+        remover_arquivo_parcial(file_path)
+    except OSError as e:
+        print(f"Erro ao salvar {file_path}: {e}")
+        remover_arquivo_parcial(file_path)
+    except BaseException:
+        remover_arquivo_parcial(file_path)
+        raise
 
 # Função para baixar conteúdo de uma URL
 def baixar_conteudo(url, config):
@@ -117,7 +157,7 @@ def baixar_conteudo(url, config):
     os.makedirs(post_path, exist_ok=True)
 
     if config["salvar_info_txt"]:
-        salvar_info_post(soup, post_path, config["salvar_comentarios_txt"])
+        salvar_info_post(soup, post_path, url, config["salvar_comentarios_txt"])
 
     links_baixados = set()
     image_tags = soup.find_all("a", class_="fileThumb")
@@ -125,34 +165,22 @@ def baixar_conteudo(url, config):
     for index, img_tag in enumerate(image_tags):
         image_url = img_tag["href"]
         if image_url not in links_baixados:
-            image_response = requests.get(image_url)
             filename = f"image_{index + 1}.jpg"
-            with open(os.path.join(post_path, filename), "wb") as f:
-                f.write(image_response.content)
+            baixar_arquivo(image_url, os.path.join(post_path, filename))
             links_baixados.add(image_url)
 
-    if config["baixar_anexos"]:
+    if config["baixar_anexos"] or config["baixar_videos"]:
         attachment_tags = soup.find_all("a", class_="post__attachment-link")
         for index, attachment_tag in enumerate(attachment_tags):
             attachment_url = attachment_tag["href"]
+            filename = attachment_tag["download"]
+            is_video = os.path.splitext(filename)[1].lower() in VIDEO_EXTS
+            if not (config["baixar_anexos"] or (is_video and config["baixar_videos"])):
+                continue
             if attachment_url not in links_baixados:
-                attachment_response = requests.get(attachment_url)
-                filename = attachment_tag["download"]
-                with open(os.path.join(post_path, filename), "wb") as f:
-                    f.write(attachment_response.content)
+                baixar_arquivo(attachment_url, os.path.join(post_path, filename))
                 links_baixados.add(attachment_url)
 
-    if config["baixar_videos"]:
-        video_tags = soup.find_all("a", class_="post__attachment-link")
-        for index, video_tag in enumerate(video_tags):
-            video_url = video_tag["href"]
-            if video_url not in links_baixados:
-                video_response = requests.get(video_url)
-                filename = video_tag["download"]
-                with open(os.path.join(post_path, filename), "wb") as f:
-                    f.write(video_response.content)
-                links_baixados.add(video_url)
-
     print(f"Conteúdo do post {url} baixado com sucesso!")
 
 # Carregar configurações do arquivo JSON